@@ -247,6 +247,7 @@ base_deps = [
     "peft-singlora>=0.2.0",
     "cryptography>=41.0.0",
     "torchcodec>=0.8.1",
+    "orjson>=3.9.0",
 ]
 
 platform_deps_for_install = get_platform_dependencies()
@@ -2558,6 +2558,10 @@ class FactoryRegistry:
             if init_backend["metadata_backend"].resolution < 256:
                 warning_log("Increasing resolution to 256, as is required for DF Stage II.")
 
+        sampler_seed = getattr(self.args, "seed", None)
+        if sampler_seed and getattr(self.args, "seed_for_each_device", True):
+            # Mirror accelerate's set_seed(device_specific=True) so ranks don't draw identical sequences.
+            sampler_seed = int(sampler_seed) + get_rank()
         init_backend["sampler"] = MultiAspectSampler(
             id=init_backend["id"],
             metadata_backend=init_backend["metadata_backend"],
@@ -2577,6 +2581,7 @@ class FactoryRegistry:
             is_regularisation_data=is_regularisation_data,
             dataset_type=backend.get("dataset_type"),
             source_dataset_id=init_backend["config"].get("source_dataset_id", None),
+            seed=sampler_seed,
         )
         if init_backend["sampler"].caption_strategy == "parquet":
             configure_parquet_database(backend, self.args, init_backend["data_backend"])
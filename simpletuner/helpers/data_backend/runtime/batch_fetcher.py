@@ -104,10 +104,10 @@ class BatchFetcher:
         self.step = step
         if self.queue.empty():
             prefetch_log_debug("Queue is empty. Waiting for data.")
-        while self.queue.empty():
-            continue
+        # Block on the queue rather than spinning, so the fetch thread isn't starved of the GIL while we wait.
+        item = self.queue.get()
         prefetch_log_debug("Queue has data. Yielding next item.")
-        return self.queue.get()
+        return item
 
     def stop_fetching(self) -> None:
         self._keep_running = False
@@ -32,6 +32,9 @@ DEFAULT_AUDIO_BUCKET_INTERVAL = 3.0
 
 
 class MetadataBackend:
+    # Class-level default so the setter works for subclasses that assign buckets before calling __init__.
+    _bucket_indices_version = 0
+
     def __init__(
         self,
         id: str,
@@ -154,6 +157,12 @@ class MetadataBackend:
                     f"New buckets: {list(value.keys()) if value else []}"
                 )
         self._aspect_ratio_bucket_indices = value
+        self._bucket_indices_version += 1
+
+    @property
+    def bucket_indices_version(self) -> int:
+        """Counter bumped whenever bucket membership changes, so samplers know to refresh derived state."""
+        return self._bucket_indices_version
 
     def _extract_audio_config(self) -> Dict[str, Any]:
         if self.dataset_config is None:
@@ -644,6 +653,7 @@ class MetadataBackend:
 
     def remove_image(self, image_path, bucket: str = None):
         """remove image from bucket(s)"""
+        self._bucket_indices_version += 1
         if not bucket:
             for bucket, images in self.aspect_ratio_bucket_indices.items():
                 if image_path in images:
@@ -657,6 +667,7 @@ class MetadataBackend:
         logger.debug(
             f"Before updating, in all buckets, we had {sum([len(bucket) for bucket in self.aspect_ratio_bucket_indices.values()])}."
         )
+        self._bucket_indices_version += 1
         for bucket, images in self.aspect_ratio_bucket_indices.items():
             # dedupe while preserving order
             filtered_images = list(dict.fromkeys(img for img in images if img in existing_files))
@@ -871,10 +882,8 @@ class MetadataBackend:
                     f"--minimum_image_size was given with a value of {self.minimum_image_size} but resolution_type is area, which means this value is most likely too large. Please use a value less than 5."
                 )
             minimum_image_size = self.minimum_image_size * 1_000_000
-            if (
-                StateTracker.get_data_backend_config(self.id).get("crop", False)
-                and StateTracker.get_data_backend_config(self.id).get("crop_aspect", "square") == "square"
-            ):
+            backend_config = StateTracker.get_data_backend_config(self.id)
+            if backend_config.get("crop", False) and backend_config.get("crop_aspect", "square") == "square":
                 # square crop needs minimum edge length check
                 pixel_edge_len = floor(np.sqrt(minimum_image_size))
                 if not (pixel_edge_len <= width and pixel_edge_len <= height):
@@ -888,6 +897,7 @@ class MetadataBackend:
     def handle_incorrect_bucket(self, image_path: str, bucket: str, actual_bucket: str, save_cache: bool = True):
         """move incorrectly bucketed image to proper bucket"""
         logger.debug(f"Found an image in bucket {bucket} it doesn't belong in, when actually it is: {actual_bucket}")
+        # remove_image bumps the bucket indices version for the add below as well.
         self.remove_image(image_path, bucket)
         if actual_bucket in self.aspect_ratio_bucket_indices:
             logger.debug("Moved image to bucket, it already existed.")
@@ -962,14 +972,15 @@ class MetadataBackend:
             filepath = [filepath]
         if type(filepath) is tuple or type(filepath) is list:
             for path in filepath:
-                abs_path = self.data_backend.get_abs_path(path)
                 if path in self.image_metadata:
                     result = self.image_metadata.get(path, None)
                     if result is not None:
                         return result
-                elif abs_path in self.image_metadata:
-                    filepath = abs_path
-                    result = self.image_metadata.get(filepath, None)
+                    continue
+                # only consult the data backend on a cache miss, some backends stat the path here.
+                abs_path = self.data_backend.get_abs_path(path)
+                if abs_path in self.image_metadata:
+                    result = self.image_metadata.get(abs_path, None)
                     if result is not None:
                         return result
             return None
@@ -1156,6 +1167,7 @@ class MetadataBackend:
         """move cache file to correct bucket based on actual aspect ratio"""
         for bucket, files in self.aspect_ratio_bucket_indices.items():
             if cache_file in files and str(bucket) != str(expected_bucket):
+                self._bucket_indices_version += 1
                 files.remove(cache_file)
                 self.aspect_ratio_bucket_indices[expected_bucket].append(cache_file)
                 break
@@ -5,6 +5,8 @@ import traceback
 from io import BytesIO
 from typing import Optional
 
+from PIL import Image, UnidentifiedImageError
+
 from simpletuner.helpers.audio import load_audio
 from simpletuner.helpers.data_backend.base import BaseDataBackend
 from simpletuner.helpers.data_backend.dataset_types import DatasetType
@@ -225,11 +227,23 @@ class DiscoveryMetadataBackend(MetadataBackend):
                 return aspect_ratio_bucket_indices
 
             file_extension = os.path.splitext(image_path_str)[1].lower()
-            file_loader = load_image
+            image = None
             if file_extension.strip(".") in video_file_extensions:
-                file_loader = load_video
-            image = file_loader(BytesIO(image_data))
-            if not self.meets_resolution_requirements(image=image):
+                image = load_video(BytesIO(image_data))
+                meets_resolution_requirements = self.meets_resolution_requirements(image=image)
+            else:
+                # The size checks are orientation-independent, so the header is enough to reject small images undecoded.
+                try:
+                    with Image.open(BytesIO(image_data)) as image_header:
+                        image_size = image_header.size
+                except (Image.DecompressionBombError, UnidentifiedImageError):
+                    # PIL's pixel limit and format support are stricter than load_image's trainingsample decoder.
+                    image = load_image(BytesIO(image_data))
+                    image_size = image.size
+                meets_resolution_requirements = self.meets_resolution_requirements(
+                    image_metadata={"original_size": image_size}
+                )
+            if not meets_resolution_requirements:
                 if not self.delete_unwanted_images:
                     logger.debug(f"Image {image_path_str} does not meet minimum size requirements. Skipping image.")
                 else:
@@ -239,6 +253,8 @@ class DiscoveryMetadataBackend(MetadataBackend):
                 statistics["skipped"]["too_small"] += 1
                 return aspect_ratio_bucket_indices
 
+            if image is None:
+                image = load_image(BytesIO(image_data))
             if hasattr(image, "shape"):
                 image_metadata["original_size"] = (image.shape[2], image.shape[1])
                 image_metadata["num_frames"] = image.shape[0]
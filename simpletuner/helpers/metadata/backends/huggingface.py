@@ -776,6 +776,7 @@ class HuggingfaceMetadataBackend(MetadataBackend):
         if not isinstance(image_paths, list):
             image_paths = [image_paths]
 
+        self._bucket_indices_version += 1
         for image_path in image_paths:
             if image_path in self.caption_cache:
                 del self.caption_cache[image_path]
@@ -1,6 +1,8 @@
 import logging
 import os
 import random
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
 import numpy as np
 import torch
@@ -47,6 +49,7 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         is_regularisation_data: bool = False,
         dataset_type: str = "image",
         source_dataset_id: str = None,
+        seed: int = None,
     ):
         """
         Initializes the sampler with provided settings.
@@ -58,6 +61,7 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         - debug_aspect_buckets: Flag to log state for debugging purposes.
         - delete_unwanted_images: Flag to decide whether to delete unwanted (small) images or just remove from the bucket.
         - minimum_image_size: The minimum pixel length of the smallest side of an image.
+        - seed: Seed for the sampler's own random number generator. If unset, it is seeded from os.urandom.
         """
         self.id = id
         if self.id != data_backend.id or self.id != metadata_backend.id:
@@ -99,6 +103,7 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         self.current_bucket = None
         self.current_epoch = 1
         self.batch_size = batch_size
+        self._rng = random.Random(int(seed) if seed else None)
         if debug_aspect_buckets:
             self.logger.setLevel(logging.DEBUG)
         self.delete_unwanted_images = delete_unwanted_images
@@ -111,22 +116,32 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         self.instance_prompt = instance_prompt
         self.exhausted_buckets = []
         self.buckets = self.load_buckets()
+        self._unseen_by_bucket = None
+        self._unseen_positions = None
+        self._unseen_bucket_indices_version = None
+        self._total_unseen = 0
+        # Caption lookups may hit the data backend (eg. textfile captions), so a batch is fetched concurrently.
+        self._sample_pool = ThreadPoolExecutor(
+            max_workers=max(1, int(batch_size)), thread_name_prefix=f"MultiAspectSampler-{self.id}"
+        )
         self.state_manager = BucketStateManager(self.id)
-        self._val_master_list = sorted(sum(self.metadata_backend.aspect_ratio_bucket_indices.values(), []))
+        self._val_master_list = sorted(chain.from_iterable(self.metadata_backend.aspect_ratio_bucket_indices.values()))
 
     def save_state(self, state_path: str):
         """
         This method should be called when the accelerator save hook is called,
          so that the state is correctly restored with a given checkpoint.
+
+        The bucket indices are rebuilt from the metadata backend on load, so only the
+        sampler's progress is stored; seen samples are written as a list of paths.
         """
         state = {
-            "aspect_ratio_bucket_indices": self.metadata_backend.aspect_ratio_bucket_indices,
-            "buckets": self.buckets,
             "exhausted_buckets": self.exhausted_buckets,
             "batch_size": self.batch_size,
             "current_bucket": self.current_bucket,
-            "seen_images": self.metadata_backend.seen_images,
+            "seen_images": list(self.metadata_backend.seen_images.keys()),
             "current_epoch": self.current_epoch,
+            "rng_state": self._rng.getstate(),
         }
         self.state_manager.save_state(state, state_path)
 
@@ -147,7 +162,38 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         # Merge seen_images into self.state_manager.seen_images Manager.dict:
         if "seen_images" in previous_state:
             self.logger.info(f"Previous checkpoint had {len(previous_state['seen_images'])} seen {self.sample_type_strs}.")
-            self.metadata_backend.seen_images.update(previous_state["seen_images"])
+            # Older checkpoints stored seen_images as a {path: True} mapping.
+            self.metadata_backend.seen_images.update(dict.fromkeys(previous_state["seen_images"], True))
+        if "rng_state" in previous_state:
+            # JSON turns the generator's internal state tuple into a list.
+            version, internal_state, gauss_next = previous_state["rng_state"]
+            self._rng.setstate((version, tuple(internal_state), gauss_next))
+        self._rebuild_unseen_images()
+
+    @property
+    def buckets(self):
+        return self._buckets
+
+    @buckets.setter
+    def buckets(self, value):
+        self._buckets = value
+        self._rebuild_bucket_ids()
+
+    def _rebuild_bucket_ids(self):
+        self._bucket_ids = {bucket: idx for idx, bucket in enumerate(self._buckets)}
+        # Numeric aliases let 1.78 find the "1.78" bucket without converting on every lookup.
+        self._bucket_aliases = {}
+        for bucket, idx in self._bucket_ids.items():
+            alias = self._bucket_alias(bucket)
+            if alias is not None:
+                self._bucket_aliases.setdefault(alias, idx)
+
+    @staticmethod
+    def _bucket_alias(bucket):
+        try:
+            return float(bucket)
+        except (TypeError, ValueError):
+            return None
 
     def load_buckets(self):
         return list(self.metadata_backend.aspect_ratio_bucket_indices.keys())  # These keys are a float value, eg. 1.78.
@@ -223,7 +269,7 @@ class MultiAspectSampler(torch.utils.data.Sampler):
             validation_prompt = PromptHandler.magic_prompt(**prompt_kwargs)
             if type(validation_prompt) == list:
                 self.debug_log(f"Selecting random prompt from list: {validation_prompt}")
-                validation_prompt = random.choice(validation_prompt)
+                validation_prompt = self._rng.choice(validation_prompt)
             results.append(
                 (
                     validation_shortname,
@@ -250,7 +296,7 @@ class MultiAspectSampler(torch.utils.data.Sampler):
             to_grab = min(n, len(available_images), (n - len(samples)))
             if to_grab == 0:
                 break
-            samples.extend(random.sample(available_images, k=to_grab))
+            samples.extend(self._rng.sample(available_images, k=to_grab))
 
         to_yield = self._validate_and_yield_images_from_samples(samples, bucket)
         return to_yield
@@ -270,11 +316,11 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         return path
 
     def _yield_random_image(self):
-        bucket = random.choice(self.buckets)
+        bucket = self._rng.choice(self.buckets)
         bucket_images = self._get_bucket_images(bucket)
         if not bucket_images:
             raise ValueError(f"Bucket {bucket} is empty")
-        image_path = random.choice(bucket_images)
+        image_path = self._rng.choice(bucket_images)
         return image_path
 
     def yield_single_image(self, filepath: str):
@@ -307,25 +353,26 @@ class MultiAspectSampler(torch.utils.data.Sampler):
             if int(bucket_name) == bucket_name and 0 <= int(bucket_name) < len(self.buckets):
                 return int(bucket_name)
             # Otherwise try to resolve by value in buckets (for float bucket identifiers).
-            if bucket_name in self.buckets:
-                return self.buckets.index(bucket_name)
+            if bucket_name in self._bucket_ids:
+                return self._bucket_ids[bucket_name]
+            if bucket_name in self._bucket_aliases:
+                return self._bucket_aliases[bucket_name]
         name = str(bucket_name)
         if name.isdigit():
             self.debug_log(f"Assuming {bucket_name} is already an index.")
             return int(name)
+        if bucket_name in self._bucket_ids:
+            return self._bucket_ids[bucket_name]
         try:
             numeric_name = float(name)
-            for idx, bucket in enumerate(self.buckets):
-                if isinstance(bucket, (int, float)) and bucket == numeric_name:
-                    return idx
+            if numeric_name in self._bucket_aliases:
+                return self._bucket_aliases[numeric_name]
         except (TypeError, ValueError):
             pass
-        if bucket_name in self.buckets:
-            return self.buckets.index(bucket_name)
         raise ValueError(f"Bucket name {bucket_name} not found in buckets: {self.buckets}")
 
     def _reset_buckets(self, raise_exhaustion_signal: bool = True):
-        if len(self.metadata_backend.seen_images) == 0 and len(self._get_unseen_images()) == 0:
+        if len(self.metadata_backend.seen_images) == 0 and self._count_unseen_images() == 0:
             bucket_report = getattr(self.metadata_backend, "bucket_report", None)
             if bucket_report:
                 bucket_report.add_note("Sampler attempted to reset buckets but none were available.")
@@ -349,23 +396,24 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         self.exhausted_buckets = []
         self.buckets = self.load_buckets()
         self.metadata_backend.reset_seen_images()
+        self._rebuild_unseen_images()
         self.change_bucket()
         if raise_exhaustion_signal:
             raise MultiDatasetExhausted()
 
-    def _get_bucket_images(self, bucket):
+    def _resolve_bucket_key(self, bucket):
         """
-        Safely retrieve bucket images, trying both original type and type conversion.
+        Resolve a bucket to its key in aspect_ratio_bucket_indices, trying both original type and type conversion.
 
         Args:
             bucket: The bucket key (could be float or str)
 
         Returns:
-            list: List of images in the bucket, or empty list if bucket not found
+            The matching key, or None if the bucket was not found
         """
         # Try the original bucket key first
         if bucket in self.metadata_backend.aspect_ratio_bucket_indices:
-            return self.metadata_backend.aspect_ratio_bucket_indices[bucket]
+            return bucket
 
         # Try converting between str and float
         try:
@@ -373,57 +421,120 @@ class MultiAspectSampler(torch.utils.data.Sampler):
                 # Try converting str to float
                 bucket_as_float = float(bucket)
                 if bucket_as_float in self.metadata_backend.aspect_ratio_bucket_indices:
-                    return self.metadata_backend.aspect_ratio_bucket_indices[bucket_as_float]
+                    return bucket_as_float
             elif isinstance(bucket, (float, int)):
                 # Try converting float/int to str
                 bucket_as_str = str(bucket)
                 if bucket_as_str in self.metadata_backend.aspect_ratio_bucket_indices:
-                    return self.metadata_backend.aspect_ratio_bucket_indices[bucket_as_str]
+                    return bucket_as_str
         except (ValueError, TypeError):
             pass
 
         # Bucket not found with either type
-        return []
+        return None
+
+    def _get_bucket_images(self, bucket):
+        """
+        Safely retrieve bucket images, trying both original type and type conversion.
+
+        Args:
+            bucket: The bucket key (could be float or str)
+
+        Returns:
+            list: List of images in the bucket, or empty list if bucket not found
+        """
+        bucket_key = self._resolve_bucket_key(bucket)
+        if bucket_key is None:
+            return []
+        return self.metadata_backend.aspect_ratio_bucket_indices[bucket_key]
+
+    def _rebuild_unseen_images(self):
+        """
+        Rebuild the per-bucket index of unseen {self.sample_type_strs} from the metadata backend's seen list.
+
+        Each bucket keeps a list that random.sample can draw from directly, alongside a
+        path -> list index map so that marking a sample as seen is an O(1) swap-and-pop.
+        """
+        instance_data_dir = self.metadata_backend.instance_data_dir
+        # seen_images only ever holds True values, so membership matches metadata_backend.is_seen().
+        seen_images = self.metadata_backend.seen_images
+        self._unseen_by_bucket = {}
+        self._unseen_positions = {}
+        self._unseen_bucket_indices_version = self.metadata_backend.bucket_indices_version
+        for bucket, images in self.metadata_backend.aspect_ratio_bucket_indices.items():
+            unseen_images = list(
+                dict.fromkeys(
+                    (os.path.join(instance_data_dir, image) if not image.startswith("http") else image)
+                    for image in images
+                    if image not in seen_images
+                )
+            )
+            self._unseen_by_bucket[bucket] = unseen_images
+            self._unseen_positions[bucket] = {image: idx for idx, image in enumerate(unseen_images)}
+        self._total_unseen = sum(map(len, self._unseen_by_bucket.values()))
+
+    def _unseen_index_is_stale(self) -> bool:
+        # Removals and epoch rollover rebucketing change the backend's lists underneath the index.
+        return (
+            self._unseen_by_bucket is None
+            or self._unseen_bucket_indices_version != self.metadata_backend.bucket_indices_version
+        )
+
+    def _mark_batch_as_seen(self, image_paths, bucket):
+        self.metadata_backend.mark_batch_as_seen(image_paths)
+        if self._unseen_index_is_stale():
+            # The next read rebuilds from seen_images, which already includes this batch.
+            return
+        bucket_key = self._resolve_bucket_key(bucket)
+        unseen_images = self._unseen_by_bucket.get(bucket_key)
+        positions = self._unseen_positions.get(bucket_key)
+        if not unseen_images:
+            return
+        for image_path in image_paths:
+            idx = positions.pop(image_path, None)
+            if idx is None:
+                continue
+            last_image = unseen_images.pop()
+            self._total_unseen -= 1
+            if idx < len(unseen_images):
+                unseen_images[idx] = last_image
+                positions[last_image] = idx
+
+    def _count_unseen_images(self) -> int:
+        """
+        Return the number of unseen {self.sample_type_strs} across all buckets, without flattening them.
+        """
+        if self._unseen_index_is_stale():
+            self._rebuild_unseen_images()
+        return self._total_unseen
 
     def _get_unseen_images(self, bucket=None):
         """
         Get unseen {self.sample_type_strs} from the specified bucket.
         If bucket is None, get unseen {self.sample_type_strs} from all buckets.
+
+        The per-bucket list is returned as-is and shrinks as batches are marked seen; callers must not modify it.
         """
+        if self._unseen_index_is_stale():
+            self._rebuild_unseen_images()
         if bucket:
-            bucket_images = self._get_bucket_images(bucket)
+            bucket_key = self._resolve_bucket_key(bucket)
+            unseen_images = self._unseen_by_bucket.get(bucket_key, [])
             # Debug: Track bucket contents
             self.debug_log(
                 f"_get_unseen_images(bucket={bucket}): "
-                f"bucket has {len(bucket_images)} total images, "
+                f"bucket has {len(unseen_images)} unseen images, "
                 f"seen_images has {len(self.metadata_backend.seen_images)} entries"
             )
-            if len(bucket_images) == 0:
+            if bucket_key is None or len(self.metadata_backend.aspect_ratio_bucket_indices[bucket_key]) == 0:
                 self.logger.warning(
                     f"BUCKET {bucket} IS EMPTY! aspect_ratio_bucket_indices keys: "
                     f"{list(self.metadata_backend.aspect_ratio_bucket_indices.keys())}"
                 )
 
-            return [
-                (os.path.join(self.metadata_backend.instance_data_dir, image) if not image.startswith("http") else image)
-                for image in bucket_images
-                if not self.metadata_backend.is_seen(image)
-            ]
-        elif bucket is None:
-            unseen_images = []
-            for b, images in self.metadata_backend.aspect_ratio_bucket_indices.items():
-                unseen_images.extend(
-                    [
-                        (
-                            os.path.join(self.metadata_backend.instance_data_dir, image)
-                            if not image.startswith("http")
-                            else image
-                        )
-                        for image in images
-                        if not self.metadata_backend.is_seen(image)
-                    ]
-                )
             return unseen_images
+        elif bucket is None:
+            return [image for unseen_images in self._unseen_by_bucket.values() for image in unseen_images]
         else:
             return []
 
@@ -464,7 +575,7 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         else:
             self.current_bucket = 0
         if self.buckets[self.current_bucket] not in available_buckets:
-            random_bucket = random.choice(available_buckets)
+            random_bucket = self._rng.choice(available_buckets)
             self.current_bucket = available_buckets.index(random_bucket)
 
         next_bucket = available_buckets[self.current_bucket]
@@ -477,8 +588,8 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         """
         next_bucket = self._get_next_bucket()
         # Resolve to an integer index in self.buckets for downstream indexing.
-        if next_bucket in self.buckets:
-            self.current_bucket = self.buckets.index(next_bucket)
+        if next_bucket in self._bucket_ids:
+            self.current_bucket = self._bucket_ids[next_bucket]
         else:
             # Fallback for stringified indices (e.g., "0", "1") or float/int values.
             try:
@@ -494,22 +605,28 @@ class MultiAspectSampler(torch.utils.data.Sampler):
     def move_to_exhausted(self):
         bucket = self.buckets[self.current_bucket]
         self.exhausted_buckets.append(bucket)
-        self.buckets.remove(bucket)
+        # Swap the last bucket into the freed slot so only its index entries need updating.
+        idx = self._bucket_ids.pop(bucket)
+        alias = self._bucket_alias(bucket)
+        if alias is not None and self._bucket_aliases.get(alias) == idx:
+            del self._bucket_aliases[alias]
+        last_bucket = self.buckets.pop()
+        if idx < len(self.buckets):
+            last_idx = len(self.buckets)
+            self.buckets[idx] = last_bucket
+            self._bucket_ids[last_bucket] = idx
+            last_alias = self._bucket_alias(last_bucket)
+            if last_alias is not None and self._bucket_aliases.get(last_alias) == last_idx:
+                self._bucket_aliases[last_alias] = idx
         self.debug_log(
             f"Bucket {bucket} is empty or doesn't have enough samples for a full batch. Removing from bucket list. {len(self.buckets)} remain."
         )
 
     def log_state(self, show_rank: bool = True, alt_stats: bool = False):
-        # self.debug_log(
-        #     f'Active Buckets: {", ".join(self.convert_to_human_readable(float(b), self.metadata_backend.aspect_ratio_bucket_indices[b], self.resolution) for b in self.buckets)}'
-        # )
-        # self.debug_log(
-        #     f'Exhausted Buckets: {", ".join(self.convert_to_human_readable(float(b), self.metadata_backend.aspect_ratio_bucket_indices.get(b, "N/A"), self.resolution) for b in self.exhausted_buckets)}'
-        # )
         if alt_stats:
             # Return an overview instead of a snapshot.
             # Eg. return totals, and not "as it is now"
-            total_image_count = len(self.metadata_backend.seen_images) + len(self._get_unseen_images())
+            total_image_count = len(self.metadata_backend.seen_images) + self._count_unseen_images()
             if self.accelerator.num_processes > 1:
                 # We don't know the direct count without more work, so we'll estimate it here for multi-GPU training.
                 total_image_count *= self.accelerator.num_processes
@@ -543,9 +660,12 @@ class MultiAspectSampler(torch.utils.data.Sampler):
             printed_state = "\n".join(printed_state) + "\n"
         else:
             # Return a snapshot of the current state during training.
+            if not self.logger.isEnabledFor(logging.INFO):
+                # Nothing consumes the snapshot besides the log, so don't build it when it would be dropped.
+                return ""
             printed_state = (
                 f"\n{self.rank_info if show_rank else ''}    -> Number of seen {self.sample_type_strs}: {len(self.metadata_backend.seen_images)}"
-                f"\n{self.rank_info if show_rank else ''}    -> Number of unseen {self.sample_type_strs}: {len(self._get_unseen_images())}"
+                f"\n{self.rank_info if show_rank else ''}    -> Number of unseen {self.sample_type_strs}: {self._count_unseen_images()}"
                 f"\n{self.rank_info if show_rank else ''}    -> Current Bucket: {self.current_bucket}"
                 f"\n{self.rank_info if show_rank else ''}    -> {len(self.buckets)} Buckets: {self.buckets}"
                 f"\n{self.rank_info if show_rank else ''}    -> {len(self.exhausted_buckets)} Exhausted Buckets: {self.exhausted_buckets}"
@@ -554,21 +674,43 @@ class MultiAspectSampler(torch.utils.data.Sampler):
 
         return printed_state
 
+    def _fetch_sample_metadata_and_prompt(self, image_path):
+        image_metadata = self.metadata_backend.get_metadata_by_filepath(image_path)
+        # Use the magic prompt handler to retrieve the captions.
+        instance_prompt = PromptHandler.magic_prompt(
+            sampler_backend_id=self.id,
+            data_backend=self.data_backend,
+            image_path=image_path,
+            caption_strategy=self.caption_strategy,
+            use_captions=self.use_captions,
+            prepend_instance_prompt=self.prepend_instance_prompt,
+            instance_prompt=self.instance_prompt,
+        )
+        return image_metadata, instance_prompt
+
     def _validate_and_yield_images_from_samples(self, samples, bucket):
         """
         Validate and yield images from given samples. Return a list of valid image paths.
         """
+        requires_crop = StateTracker.get_args().model_family not in [
+            "sd1x",
+            "sd2x",
+            "deepfloyd",
+            "ace_step",
+        ]
+        # Batches topped up from a small bucket repeat paths; fetch each one only once.
+        unique_samples = list(dict.fromkeys(samples))
+        fetched = dict(zip(unique_samples, self._sample_pool.map(self._fetch_sample_metadata_and_prompt, unique_samples)))
+        emitted = set()
         to_yield = []
         for image_path in samples:
-            image_metadata = self.metadata_backend.get_metadata_by_filepath(image_path)
+            image_metadata, instance_prompt = fetched[image_path]
             if image_metadata is None:
                 image_metadata = {}
-            requires_crop = StateTracker.get_args().model_family not in [
-                "sd1x",
-                "sd2x",
-                "deepfloyd",
-                "ace_step",
-            ]
+            elif image_path in emitted:
+                # Repeats get their own dict so each keeps its own prompt selection.
+                image_metadata = dict(image_metadata)
+            emitted.add(image_path)
             if requires_crop and "crop_coordinates" not in image_metadata:
                 raise Exception(
                     f"An image was discovered ({image_path}) that did not have its metadata: {self.metadata_backend.get_metadata_by_filepath(image_path)}"
@@ -576,18 +718,8 @@ class MultiAspectSampler(torch.utils.data.Sampler):
             image_metadata["data_backend_id"] = self.id
             image_metadata["image_path"] = image_path
 
-            # Use the magic prompt handler to retrieve the captions.
-            instance_prompt = PromptHandler.magic_prompt(
-                sampler_backend_id=self.id,
-                data_backend=self.data_backend,
-                image_path=image_metadata["image_path"],
-                caption_strategy=self.caption_strategy,
-                use_captions=self.use_captions,
-                prepend_instance_prompt=self.prepend_instance_prompt,
-                instance_prompt=self.instance_prompt,
-            )
             if type(instance_prompt) == list:
-                instance_prompt = random.choice(instance_prompt)
+                instance_prompt = self._rng.choice(instance_prompt)
                 self.debug_log(f"Selecting random prompt from list: {instance_prompt}")
             image_metadata["instance_prompt_text"] = instance_prompt
 
@@ -661,7 +793,7 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         self.logger.debug(f"Using prompt kwargs: {prompt_kwargs}")
         instance_prompt = PromptHandler.magic_prompt(**prompt_kwargs)
         if type(instance_prompt) == list:
-            instance_prompt = random.choice(instance_prompt)
+            instance_prompt = self._rng.choice(instance_prompt)
             self.debug_log(f"Selecting random prompt from list: {instance_prompt}")
         conditioning_sample.set_caption(instance_prompt)
 
@@ -812,77 +944,20 @@ class MultiAspectSampler(torch.utils.data.Sampler):
         self._clear_batch_accumulator()  # Initialize an empty list to accumulate images for a batch
         self.change_bucket()
         while True:
-            all_buckets_exhausted = True  # Initial assumption
-
-            # Loop through all buckets to find one with sufficient images
+            # Loop through all buckets to find one with unseen images
+            available_images = []
             for _ in range(len(self.buckets)):
-                self._clear_batch_accumulator()
                 available_images = self._get_unseen_images(self.buckets[self.current_bucket])
                 self.debug_log(
-                    f"From {len(self.buckets)} buckets, selected {self.buckets[self.current_bucket]} ({self.buckets[self.current_bucket]}) -> {len(available_images)} available images, and our accumulator has {len(self.batch_accumulator)} images ready for yielding."
+                    f"From {len(self.buckets)} buckets, selected {self.buckets[self.current_bucket]} ({self.buckets[self.current_bucket]}) -> {len(available_images)} available images."
                 )
                 if len(available_images) > 0:
-                    all_buckets_exhausted = False  # Found a non-exhausted bucket
                     break
-                else:
-                    # Current bucket doesn't have enough images, try the next bucket
-                    self.move_to_exhausted()
-                    self.change_bucket()
-            while len(available_images) > 0:
-                if len(available_images) < self.batch_size:
-                    need_image_count = self.batch_size - len(available_images)
-                    self.debug_log(
-                        f"Bucket {self.buckets[self.current_bucket]} has {len(available_images)} available images, but we need {need_image_count} more."
-                    )
-                    to_yield = self._yield_n_from_exhausted_bucket(need_image_count, self.buckets[self.current_bucket])
-                    # add the available images
-                    to_yield.extend(
-                        self._validate_and_yield_images_from_samples(available_images, self.buckets[self.current_bucket])
-                    )
-                else:
-                    all_buckets_exhausted = False  # Found a non-exhausted bucket
-                    samples = random.sample(available_images, k=min(len(available_images), self.batch_size))
-                    to_yield = self._validate_and_yield_images_from_samples(samples, self.buckets[self.current_bucket])
-                self.debug_log(f"Building batch with {len(self.batch_accumulator)} samples.")
-                if len(self.batch_accumulator) < self.batch_size:
-                    remaining_entries_needed = self.batch_size - len(self.batch_accumulator)
-                    # Now we'll add only remaining_entries_needed amount to the accumulator:
-                    if "target_size" in to_yield[0]:
-                        self.debug_log(
-                            f"Current bucket: {self.current_bucket}. Adding samples with aspect ratios: {[MultiaspectImage.calculate_image_aspect_ratio(i['target_size']) for i in to_yield[:remaining_entries_needed]]}"
-                        )
-                    self.batch_accumulator.extend(to_yield[:remaining_entries_needed])
-                # If the batch is full, yield it
-                if len(self.batch_accumulator) >= self.batch_size:
-                    final_yield = self.batch_accumulator[: self.batch_size]
-                    self.debug_log(
-                        f"Yielding samples and marking {len(final_yield)} images as seen, we have {len(self.metadata_backend.seen_images.values())} seen {self.sample_type_strs} before adding."
-                    )
-                    self.metadata_backend.mark_batch_as_seen([instance["image_path"] for instance in final_yield])
-                    # if applicable, we'll append TrainingSample(s) to the end for conditioning inputs.
-                    final_yield = self.connect_conditioning_samples(final_yield)
-                    yield tuple(final_yield)
-                    # Change bucket after a full batch is yielded
-                    self.change_bucket()
-                    # Break out of the while loop:
-                    break
-
-                # Update available images after yielding
-                available_images = self._get_unseen_images(self.buckets[self.current_bucket])
-                self.debug_log(
-                    f"Bucket {self.buckets[self.current_bucket]} now has {len(available_images)} available images after yielding."
-                )
-
-            # Handle exhausted bucket
-            if len(available_images) < self.batch_size:
-                self.debug_log(
-                    f"Bucket {self.buckets[self.current_bucket]} is now exhausted and sleepy, and we have to move it to the sleepy list before changing buckets."
-                )
+                # Current bucket has no unseen images left, try the next bucket
                 self.move_to_exhausted()
                 self.change_bucket()
 
-            # Check if all buckets are exhausted
-            if all_buckets_exhausted:
+            if len(available_images) == 0:
                 # If all buckets are exhausted, reset the seen {self.sample_type_strs} and refresh buckets
                 self.logger.warning(
                     "All buckets exhausted - since this is happening now, most likely you have chronically-underfilled buckets."
@@ -890,15 +965,48 @@ class MultiAspectSampler(torch.utils.data.Sampler):
                 # Resetting buckets raises MultiDatasetExhausted
                 self._reset_buckets()
 
+            bucket = self.buckets[self.current_bucket]
+            need_image_count = self.batch_size - len(available_images)
+            if need_image_count > 0:
+                self.debug_log(
+                    f"Bucket {bucket} has {len(available_images)} available images, but we need {need_image_count} more."
+                )
+                # Top up the batch with already-seen samples from the same bucket.
+                self.batch_accumulator.extend(self._yield_n_from_exhausted_bucket(need_image_count, bucket))
+                self.batch_accumulator.extend(self._validate_and_yield_images_from_samples(available_images, bucket))
+            else:
+                samples = self._rng.sample(available_images, k=self.batch_size)
+                self.batch_accumulator.extend(self._validate_and_yield_images_from_samples(samples, bucket))
+            if self.batch_accumulator and "target_size" in self.batch_accumulator[0]:
+                self.debug_log(
+                    f"Current bucket: {self.current_bucket}. Adding samples with aspect ratios: {[MultiaspectImage.calculate_image_aspect_ratio(i['target_size']) for i in self.batch_accumulator]}"
+                )
+
+            self.debug_log(
+                f"Yielding samples and marking {len(self.batch_accumulator)} images as seen, we have {len(self.metadata_backend.seen_images)} seen {self.sample_type_strs} before adding."
+            )
+            self._mark_batch_as_seen([instance["image_path"] for instance in self.batch_accumulator], bucket)
+            # if applicable, we'll append TrainingSample(s) to the end for conditioning inputs.
+            final_yield = self.connect_conditioning_samples(self.batch_accumulator)
+            yield tuple(final_yield)
+            self._clear_batch_accumulator()
+
+            # Re-read rather than trusting available_images, in case the buckets changed while suspended.
+            if len(self._get_unseen_images(bucket)) == 0:
+                self.debug_log(
+                    f"Bucket {bucket} is now exhausted and sleepy, and we have to move it to the sleepy list before changing buckets."
+                )
+                self.move_to_exhausted()
+            # Change bucket after a full batch is yielded
+            self.change_bucket()
+
     def __len__(self):
         backend_config = StateTracker.get_data_backend_config(self.id)
         repeats = backend_config.get("repeats", 0)
         # We need at least a multiplier of 1. Repeats is the number of extra sample steps.
         multiplier = repeats + 1 if repeats > 0 else 1
 
-        total_samples = (
-            sum(len(indices) for indices in self.metadata_backend.aspect_ratio_bucket_indices.values()) * multiplier
-        )
+        total_samples = sum(map(len, self.metadata_backend.aspect_ratio_bucket_indices.values())) * multiplier
 
         # Calculate the total number of full batches
         total_batches = (total_samples + (self.batch_size - 1)) // self.batch_size
@@ -907,17 +1015,7 @@ class MultiAspectSampler(torch.utils.data.Sampler):
 
     @staticmethod
     def convert_to_human_readable(aspect_ratio_float: float, bucket: iter, resolution: int = 1024):
-
-        if aspect_ratio_float < 1:
-            ratio_width = resolution
-            ratio_height = int(resolution / aspect_ratio_float)
-        else:
-            ratio_width = int(resolution * aspect_ratio_float)
-            ratio_height = resolution
-
-        # Return the aspect ratio as a string in the format "width:height"
         return f"{aspect_ratio_float} ({len(bucket)} samples)"
-        return f"{ratio_width}:{ratio_height}"
 
     def debug_log(self, msg: str):
         self.logger.debug(f"{self.rank_info} {msg}", main_process_only=False)
@@ -1,8 +1,9 @@
-import json
 import logging
 import os
 from multiprocessing.managers import DictProxy
 
+import orjson
+
 logger = logging.getLogger("BucketStateManager")
 from simpletuner.helpers.training.multi_process import should_log
 
@@ -27,14 +28,14 @@ class BucketStateManager:
 
     def load_seen_images(self, state_path: str):
         if os.path.exists(state_path):
-            with open(state_path, "r") as f:
-                return json.load(f)
+            with open(state_path, "rb") as f:
+                return orjson.loads(f.read())
         else:
             return {}
 
     def save_seen_images(self, seen_images, state_path: str):
-        with open(state_path, "w") as f:
-            json.dump(seen_images, f)
+        with open(state_path, "wb") as f:
+            f.write(orjson.dumps(seen_images, option=orjson.OPT_NON_STR_KEYS))
 
     def deep_convert_dict(self, d):
         if isinstance(d, dict):
@@ -52,16 +53,17 @@ class BucketStateManager:
         state_path = self.mangle_state_path(state_path)
         logger.debug(f"Saving trainer state to {state_path}")
         final_state = self.deep_convert_dict(state)
-        with open(state_path, "w") as f:
-            json.dump(final_state, f)
+        # orjson writes the same JSON as the stdlib encoder, so older state files keep loading.
+        with open(state_path, "wb") as f:
+            f.write(orjson.dumps(final_state, option=orjson.OPT_NON_STR_KEYS))
 
     def load_state(self, state_path: str):
         if state_path is None:
             raise ValueError("state_path must be specified")
         state_path = self.mangle_state_path(state_path)
         if os.path.exists(state_path):
-            with open(state_path, "r") as f:
-                return json.load(f)
+            with open(state_path, "rb") as f:
+                return orjson.loads(f.read())
         else:
             logger.debug(f"load_state found no file: {state_path}")
             return {}
@@ -131,6 +131,80 @@ class TestAudioSampler(unittest.TestCase):
             next(iterator)
             next(iterator)  # Should raise here or before
 
+    def test_single_iterator_covers_every_sample_per_epoch(self):
+        from simpletuner.helpers.training.exceptions import MultiDatasetExhausted
+
+        # An underfilled bucket is visited first; draining it must not exhaust the bucket that follows.
+        self.mock_metadata.aspect_ratio_bucket_indices = {
+            "10s": ["a.wav"],
+            "20s": ["b.wav", "c.wav", "d.wav"],
+            "30s": ["e.wav", "f.wav"],
+        }
+        sampler = MultiAspectSampler(
+            id="test_backend",
+            metadata_backend=self.mock_metadata,
+            data_backend=self.mock_data,
+            model=self.mock_model,
+            accelerator=self.mock_accelerator,
+            batch_size=2,
+            dataset_type="audio",
+        )
+
+        yielded = set()
+        iterator = iter(sampler)
+        with self.assertRaises(MultiDatasetExhausted):
+            for _ in range(20):
+                batch = next(iterator)
+                self.assertEqual(len(batch), 2)
+                yielded.update(x["image_path"] for x in batch)
+        self.assertEqual(yielded, {f"{name}.wav" for name in "abcdef"})
+
+    def _make_versioned_sampler(self, bucket_indices):
+        self.mock_metadata.aspect_ratio_bucket_indices = bucket_indices
+        self.mock_metadata.bucket_indices_version = 0
+        return MultiAspectSampler(
+            id="test_backend",
+            metadata_backend=self.mock_metadata,
+            data_backend=self.mock_data,
+            model=self.mock_model,
+            accelerator=self.mock_accelerator,
+            batch_size=2,
+            dataset_type="audio",
+        )
+
+    def test_sampler_follows_bucket_reassignment(self):
+        sampler = self._make_versioned_sampler({"10s": ["a.wav", "b.wav"], "20s": ["c.wav", "d.wav"]})
+        self.assertEqual(sampler._count_unseen_images(), 4)
+
+        # Epoch rollover rebuckets the dataset after the sampler has already indexed it.
+        self.mock_metadata.aspect_ratio_bucket_indices = {"10s": ["b.wav", "c.wav"], "20s": ["d.wav", "e.wav"]}
+        self.mock_metadata.bucket_indices_version += 1
+        self.assertEqual(sampler._count_unseen_images(), 4)
+
+        batches = [frozenset(x["image_path"] for x in next(iter(sampler))) for _ in range(2)]
+        self.assertCountEqual(batches, [{"b.wav", "c.wav"}, {"d.wav", "e.wav"}])
+
+    def test_sampler_skips_samples_removed_mid_epoch(self):
+        sampler = self._make_versioned_sampler(
+            {"10s": ["a.wav", "b.wav", "c.wav", "d.wav"], "20s": ["e.wav", "f.wav", "g.wav", "h.wav"]}
+        )
+        iterator = iter(sampler)
+        first_batch = [x["image_path"] for x in next(iterator)]
+
+        bucket_images = next(
+            images for images in self.mock_metadata.aspect_ratio_bucket_indices.values() if first_batch[0] in images
+        )
+        # Drop a still-unseen sample from the bucket that is being drained, as VAECache.remove_image does.
+        removed = next(path for path in bucket_images if path not in first_batch)
+        bucket_images.remove(removed)
+        self.mock_metadata.bucket_indices_version += 1
+        self.assertEqual(sampler._count_unseen_images(), 5)
+
+        yielded = set(first_batch)
+        for _ in range(3):
+            yielded.update(x["image_path"] for x in next(iterator))
+        self.assertNotIn(removed, yielded)
+
 
 if __name__ == "__main__":
     unittest.main()
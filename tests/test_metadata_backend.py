@@ -1,5 +1,6 @@
 import json
 import unittest
+from io import BytesIO
 from unittest.mock import MagicMock, Mock, patch
 
 try:
@@ -155,6 +156,85 @@ class TestMetadataBackend(unittest.TestCase):
             {"1.0": ["image1", "image2"], "1.5": ["image3"]},
         )
 
+    def test_get_metadata_by_filepath_skips_backend_on_cache_hit(self):
+        self.metadata_backend.image_metadata = {"/data/image1.png": {"original_size": (64, 64)}}
+        self.data_backend.get_abs_path = Mock(return_value="/data/image2.png")
+        self.assertEqual(
+            self.metadata_backend.get_metadata_by_filepath("/data/image1.png"),
+            {"original_size": (64, 64)},
+        )
+        self.data_backend.get_abs_path.assert_not_called()
+        self.assertIsNone(self.metadata_backend.get_metadata_by_filepath("image2.png"))
+        self.data_backend.get_abs_path.assert_called_once_with("image2.png")
+
+    def _process_png_for_bucket(self, size, decoded_image=None):
+        buffer = BytesIO()
+        Image.new("RGB", size, color="red").save(buffer, format="PNG")
+        self.data_backend.read = Mock(return_value=buffer.getvalue())
+        self.metadata_backend.resolution_type = "pixel"
+        self.metadata_backend.minimum_image_size = 100
+        prepared_sample = MagicMock(aspect_ratio=2.0)
+        statistics = {}
+        with (
+            patch(
+                "simpletuner.helpers.metadata.backends.discovery.load_image",
+                return_value=decoded_image or Image.new("RGB", size),
+            ) as mock_load_image,
+            patch("simpletuner.helpers.metadata.backends.discovery.TrainingSample") as mock_training_sample,
+            patch("simpletuner.helpers.metadata.backends.discovery.calculate_luminance", return_value=0.5),
+        ):
+            mock_training_sample.return_value.prepare.return_value = prepared_sample
+            bucket_indices = self.metadata_backend._process_for_bucket("image.png", {}, statistics=statistics)
+        return bucket_indices, statistics, mock_load_image
+
+    def test_process_for_bucket_rejects_small_images_before_decoding(self):
+        bucket_indices, statistics, mock_load_image = self._process_png_for_bucket((64, 32))
+        self.assertEqual(bucket_indices, {})
+        self.assertEqual(statistics["skipped"]["too_small"], 1)
+        mock_load_image.assert_not_called()
+
+    def test_process_for_bucket_decodes_images_that_pass_the_header_check(self):
+        bucket_indices, statistics, mock_load_image = self._process_png_for_bucket((256, 128))
+        self.assertEqual(bucket_indices, {"2.0": ["image.png"]})
+        self.assertNotIn("skipped", statistics)
+        mock_load_image.assert_called_once()
+
+    def test_process_for_bucket_decodes_images_over_the_pil_pixel_limit(self):
+        with patch.object(Image, "MAX_IMAGE_PIXELS", 1000):
+            bucket_indices, statistics, mock_load_image = self._process_png_for_bucket((256, 128))
+        self.assertEqual(bucket_indices, {"2.0": ["image.png"]})
+        self.assertNotIn("skipped", statistics)
+        mock_load_image.assert_called_once()
+
+    def test_bucket_indices_version_tracks_membership_changes(self):
+        version = self.metadata_backend.bucket_indices_version
+        self.metadata_backend.aspect_ratio_bucket_indices = {"1.0": ["image1", "image2"]}
+        self.assertEqual(self.metadata_backend.bucket_indices_version, version + 1)
+        self.metadata_backend.remove_image("image1", "1.0")
+        self.assertEqual(self.metadata_backend.bucket_indices_version, version + 2)
+        self.assertEqual(self.metadata_backend.aspect_ratio_bucket_indices, {"1.0": ["image2"]})
+
+    def test_enforce_resolution_constraints_matches_per_image_check(self):
+        self.metadata_backend.image_metadata = {
+            "/data/small.png": {"original_size": (64, 64)},
+            "/data/wide.png": {"original_size": (1024, 128)},
+            "/data/large.png": {"original_size": (1024, 1024)},
+        }
+        images = list(self.metadata_backend.image_metadata) + ["/data/missing.png"]
+        self.data_backend.get_abs_path = Mock(return_value=None)
+        for resolution_type, minimum_image_size in (("pixel", 512), ("area", 0.25)):
+            self.metadata_backend.resolution_type = resolution_type
+            self.metadata_backend.minimum_image_size = minimum_image_size
+            self.metadata_backend.aspect_ratio_bucket_indices = {"1.0": list(images)}
+            with patch(
+                "simpletuner.helpers.training.state_tracker.StateTracker.get_data_backend_config",
+                return_value={"crop": True, "crop_aspect": "square"},
+            ):
+                expected = [img for img in images if self.metadata_backend.meets_resolution_requirements(image_path=img)]
+                self.metadata_backend._enforce_resolution_constraints("1.0")
+            self.assertEqual(self.metadata_backend.aspect_ratio_bucket_indices["1.0"], expected)
+            self.assertEqual(expected, ["/data/large.png"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 import logging
 import os
+import tempfile
 import unittest
 from math import ceil
 
@@ -64,6 +65,39 @@ class TestMultiAspectSampler(unittest.TestCase):
             self.sampler.save_state(self.state_path)
         mock_save_state.assert_called_once()
 
+    def test_save_state_round_trips_seen_images(self):
+        self.metadata_backend.seen_images.update({"image1": True, "image3": True})
+        self.metadata_backend.instance_data_dir = ""
+        self.metadata_backend.is_seen = lambda path: path in self.metadata_backend.seen_images
+        self.sampler.save_state(self.state_path)
+        saved_state = self.sampler.state_manager.save_state.call_args[0][0]
+        self.assertNotIn("aspect_ratio_bucket_indices", saved_state)
+        self.assertEqual(saved_state["seen_images"], ["image1", "image3"])
+
+        self.metadata_backend.seen_images.clear()
+        self.sampler.state_manager.load_state.return_value = saved_state
+        self.sampler.load_states(self.state_path)
+        self.assertEqual(self.metadata_backend.seen_images, {"image1": True, "image3": True})
+        self.assertEqual(sorted(self.sampler._get_unseen_images("1.0")), ["image2", "image4"])
+        self.assertEqual(self.sampler._count_unseen_images(), 2)
+
+        self.sampler._mark_batch_as_seen(["image2"], "1.0")
+        self.assertEqual(self.sampler._count_unseen_images(), 1)
+        self.assertEqual(self.sampler._get_unseen_images("1.0"), ["image4"])
+
+    def test_save_state_resumes_random_stream(self):
+        self.metadata_backend.instance_data_dir = ""
+        self.sampler.state_manager = BucketStateManager(self.sampler.id)
+        self.sampler._rng.random()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state_path = os.path.join(tmpdir, "training_state.json")
+            self.sampler.save_state(state_path)
+            expected_draws = [self.sampler._rng.random() for _ in range(3)]
+
+            self.sampler._rng.seed(1234)
+            self.sampler.load_states(state_path)
+        self.assertEqual([self.sampler._rng.random() for _ in range(3)], expected_draws)
+
     def test_load_buckets(self):
         buckets = self.sampler.load_buckets()
         self.assertEqual(buckets, ["1.0"])
@@ -82,6 +116,36 @@ class TestMultiAspectSampler(unittest.TestCase):
         self.assertEqual(self.sampler.exhausted_buckets, ["1.0"])
         self.assertEqual(self.sampler.buckets, [])
 
+    def test_bucket_name_to_id_follows_bucket_list(self):
+        self.sampler.buckets = ["1.0", "1.5", "0.75"]
+        self.assertEqual(self.sampler._bucket_name_to_id("0.75"), 2)
+        self.assertEqual(self.sampler._bucket_name_to_id(1.5), 1)
+        self.sampler.current_bucket = 0
+        self.sampler.move_to_exhausted()
+        self.assertEqual(self.sampler._bucket_name_to_id("0.75"), self.sampler.buckets.index("0.75"))
+        self.assertEqual(self.sampler._bucket_name_to_id(0.75), self.sampler.buckets.index("0.75"))
+        self.assertEqual(self.sampler._bucket_name_to_id("1.5"), self.sampler.buckets.index("1.5"))
+        self.assertEqual(sorted(self.sampler.buckets), ["0.75", "1.5"])
+        with self.assertRaises(ValueError):
+            self.sampler._bucket_name_to_id("1.0")
+
+    def test_validate_and_yield_fetches_repeated_paths_once(self):
+        stored_metadata = {"/fake/dir/image1": {"crop_coordinates": (0, 0)}}
+        self.metadata_backend.get_metadata_by_filepath.side_effect = lambda path: stored_metadata[path]
+        samples = ["/fake/dir/image1"] * 3
+        with (
+            patch("simpletuner.helpers.training.state_tracker.StateTracker.get_args") as mock_args,
+            patch("simpletuner.helpers.prompts.PromptHandler.magic_prompt", return_value="a photo") as mock_prompt,
+        ):
+            mock_args.return_value.model_family = "flux"
+            result = self.sampler._validate_and_yield_images_from_samples(samples, "1.0")
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(self.metadata_backend.get_metadata_by_filepath.call_count, 1)
+        self.assertEqual(mock_prompt.call_count, 1)
+        self.assertEqual(len({id(sample) for sample in result}), 3)
+        self.assertTrue(all(sample["image_path"] == "/fake/dir/image1" for sample in result))
+
     def test_iter_yields_correct_batches(self):
         # Test basic iteration functionality by mocking the __iter__ method entirely
         # This avoids the complex internal state management and focuses on the interface
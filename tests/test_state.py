@@ -1,3 +1,6 @@
+import json
+import os
+import tempfile
 import unittest
 
 from simpletuner.helpers.multiaspect.state import BucketStateManager
@@ -11,6 +14,19 @@ class TestBucketStateManager(unittest.TestCase):
         # TODO: Write test cases
         self.assertEqual(True, True)
 
+    def test_state_round_trips_and_reads_stdlib_json(self):
+        manager = BucketStateManager("foo")
+        state = {"exhausted_buckets": ["1.0"], "current_epoch": 2, "seen_images": ["a.png", "b.png"]}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state_path = os.path.join(tmpdir, "training_state.json")
+            manager.save_state(state, state_path)
+            self.assertEqual(manager.load_state(state_path), state)
+
+            # State files written by the stdlib encoder must keep loading.
+            with open(manager.mangle_state_path(state_path), "w") as f:
+                json.dump({"seen_images": {"a.png": True}}, f)
+            self.assertEqual(manager.load_state(state_path), {"seen_images": {"a.png": True}})
+
 
 if __name__ == "__main__":
     unittest.main()